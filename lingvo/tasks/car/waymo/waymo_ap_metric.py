@@ -26,6 +26,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 from lingvo import compat as tf
 from lingvo.core import plot
 from lingvo.core import py_utils
@@ -33,21 +34,26 @@ from lingvo.tasks.car import ap_metric
 from lingvo.tasks.car import breakdown_metric
 
 import numpy as np
-from six.moves import range
+from six.moves import zip
 from waymo_open_dataset import label_pb2
 from waymo_open_dataset.metrics.ops import py_metrics_ops
 from waymo_open_dataset.metrics.python import config_util_py as config_util
 from waymo_open_dataset.protos import breakdown_pb2
 from waymo_open_dataset.protos import metrics_pb2
 
+# Flat container for the per-class inputs to Waymo's metric op.
+_FeedData = collections.namedtuple('_FeedData', [
+    'gt_bbox', 'gt_imgid', 'gt_speed', 'gt_difficulty', 'pd_bbox', 'pd_imgid',
+    'pd_score'
+])
+
 
 def _BuildWaymoMetricConfig(metadata, box_type, waymo_breakdown_metrics):
   """Build the Config proto for Waymo's metric op."""
   config = metrics_pb2.Config()
   # config.num_desired_score_cutoffs = metadata.NumberOfPrecisionRecallPoints()
   num_pr_points = metadata.NumberOfPrecisionRecallPoints()
-  config.score_cutoffs.extend(
-      [i * 1.0 / (num_pr_points - 1) for i in range(num_pr_points)])
+  config.score_cutoffs.extend(np.linspace(0.0, 1.0, num_pr_points).tolist())
   config.matcher_type = metrics_pb2.MatcherProto.Type.TYPE_HUNGARIAN
   if box_type == '2d':
     config.box_type = label_pb2.Label.Box.Type.TYPE_2D
@@ -55,8 +61,9 @@ def _BuildWaymoMetricConfig(metadata, box_type, waymo_breakdown_metrics):
     config.box_type = label_pb2.Label.Box.Type.TYPE_3D
   # Default values
   config.iou_thresholds[:] = [0.7, 0.7, 0.7, 0.7, 0.7]
+  class_to_idx = {n: i for i, n in enumerate(metadata.ClassNames())}
   for class_name, threshold in metadata.IoUThresholds().items():
-    cls_idx = metadata.ClassNames().index(class_name)
+    cls_idx = class_to_idx[class_name]
     config.iou_thresholds[cls_idx] = threshold
   # Run on all the data for 2 difficulty levels
   config.breakdown_generator_ids.append(breakdown_pb2.Breakdown.ONE_SHARD)
@@ -66,8 +73,12 @@ def _BuildWaymoMetricConfig(metadata, box_type, waymo_breakdown_metrics):
   config.difficulties.append(difficulty)
 
   # Add extra breakdown metrics.
+  generator_ids = dict(breakdown_pb2.Breakdown.GeneratorId.items())
   for breakdown_value in waymo_breakdown_metrics:
-    breakdown_id = breakdown_pb2.Breakdown.GeneratorId.Value(breakdown_value)
+    if breakdown_value not in generator_ids:
+      raise ValueError('Unknown waymo breakdown metric: {}. Valid values are: '
+                       '{}'.format(breakdown_value, sorted(generator_ids)))
+    breakdown_id = generator_ids[breakdown_value]
     config.breakdown_generator_ids.append(breakdown_id)
     difficulty = metrics_pb2.Difficulty()
     difficulty.levels.append(label_pb2.Label.DifficultyLevel.Value('LEVEL_1'))
@@ -76,6 +87,44 @@ def _BuildWaymoMetricConfig(metadata, box_type, waymo_breakdown_metrics):
   return config
 
 
+def _BuildSummaryPairs(metadata, breakdown_names):
+  """Returns the (eval class, breakdown) pairs that produce summaries.
+
+  'ONE_SHARD' breakdowns are the overall metrics (not sliced up), so they are
+  reported for every eval class.  Any other breakdown is only reported for the
+  class whose name appears in the breakdown name.
+
+  Args:
+    metadata: Instance of class obeying EvaluationMetadata interface.
+    breakdown_names: A list of breakdown names derived from the Waymo metric
+      config.
+
+  Returns:
+    A list of (i, classname, breakdown_name, is_overall) tuples, where i
+    indexes metadata.EvalClassIndices() and is_overall is True for 'ONE_SHARD'
+    breakdowns.
+  """
+  class_names = metadata.ClassNames()
+  lower_breakdown_names = [b.lower() for b in breakdown_names]
+  pairs = []
+  for i, class_index in enumerate(metadata.EvalClassIndices()):
+    classname = class_names[class_index]
+    lower_classname = classname.lower()
+    for breakdown_name, lower_breakdown_name in zip(breakdown_names,
+                                                    lower_breakdown_names):
+      if 'ONE_SHARD' in breakdown_name:
+        pairs.append((i, classname, breakdown_name, True))
+      elif lower_classname in lower_breakdown_name:
+        pairs.append((i, classname, breakdown_name, False))
+  return pairs
+
+
+def _BuildMetricKeys(breakdown_names):
+  """Returns the (ap, aph, pr, prh) result keys for each breakdown name."""
+  return [('ap_%s' % b, 'ap_ha_weighted_%s' % b, 'pr_%s' % b,
+           'pr_ha_weighted_%s' % b) for b in breakdown_names]
+
+
 class WaymoAPMetrics(ap_metric.APMetrics):
   """The Waymo Open Dataset implementation of AP metric."""
 
@@ -95,11 +144,14 @@ class WaymoAPMetrics(ap_metric.APMetrics):
     self._waymo_metric_config = _BuildWaymoMetricConfig(
         self.metadata, self.params.box_type,
         self.params.waymo_breakdown_metrics)
+    self._config_serialized = self._waymo_metric_config.SerializeToString()
+    # The config is fixed after construction, so the breakdown names derived
+    # from it only need to be computed once.
+    self._breakdown_names = tuple(
+        config_util.get_breakdown_names_from_config(self._waymo_metric_config))
     # Compute only waymo breakdown metrics.
-    breakdown_names = config_util.get_breakdown_names_from_config(
-        self._waymo_metric_config)
     waymo_params = WaymoBreakdownMetric.Params().Set(
-        metadata=self.metadata, breakdown_list=breakdown_names)
+        metadata=self.metadata, breakdown_list=self._breakdown_names)
     self._breakdown_metrics['waymo'] = WaymoBreakdownMetric(waymo_params)
 
     # Remove the base metric.
@@ -111,7 +163,7 @@ class WaymoAPMetrics(ap_metric.APMetrics):
                distance=None,
                num_points=None,
                rotation=None):
-    """Returns groundtruth and prediction for the classid in a NestedMap.
+    """Returns groundtruth and prediction for the classid in a _FeedData.
 
     Args:
       classid: int32 specifying the class
@@ -124,9 +176,9 @@ class WaymoAPMetrics(ap_metric.APMetrics):
         bounding box. If None is specified, all boxes are selected.
 
     Returns:
-      NestedMap containing iou_threshold, groundtruth and predictions for
-      specified, classid, difficulty level and binned distance. If no bboxes
-      are found with these parameters, returns None.
+      _FeedData containing groundtruth and predictions for specified, classid,
+      difficulty level and binned distance. If no bboxes are found with these
+      parameters, returns None.
     """
     del difficulty
     assert classid > 0 and classid < self.metadata.NumClasses()
@@ -144,25 +196,44 @@ class WaymoAPMetrics(ap_metric.APMetrics):
     if g is None or p is None:
       return None
 
-    gt_boxes = g.boxes
-    gt_imgids = g.imgids
-    gt_speeds = g.speeds
-    iou_threshold = self._iou_thresholds[self.metadata.ClassNames()[classid]]
+    return _FeedData(
+        gt_bbox=g.boxes,
+        gt_imgid=g.imgids,
+        gt_speed=g.speeds,
+        gt_difficulty=g.difficulties,
+        pd_bbox=p.boxes,
+        pd_imgid=p.imgids,
+        pd_score=p.scores)
+
+  def _DummyMetrics(self):
+    """Returns the metrics used for a class that has no data.
+
+    Returns:
+      A NestedMap in the same format as returned by _BuildMetric().
+    """
+    dummy_scalar = tf.constant(np.nan)
+    dummy_curve = tf.zeros([self.metadata.NumberOfPrecisionRecallPoints(), 2],
+                           tf.float32)
+    scalar_metrics = {'ap': dummy_scalar, 'ap_ha_weighted': dummy_scalar}
+    curve_metrics = {'pr': dummy_curve, 'pr_ha_weighted': dummy_curve}
+
+    metric_keys = self._breakdown_metrics['waymo']._metric_keys  # pylint:disable=protected-access
+    for ap_key, aph_key, pr_key, prh_key in metric_keys:
+      scalar_metrics[ap_key] = dummy_scalar
+      scalar_metrics[aph_key] = dummy_scalar
+      curve_metrics[pr_key] = dummy_curve
+      curve_metrics[prh_key] = dummy_curve
 
     return py_utils.NestedMap(
-        iou_threshold=iou_threshold,
-        gt=py_utils.NestedMap(
-            imgid=gt_imgids,
-            bbox=gt_boxes,
-            speed=gt_speeds,
-            difficulty=g.difficulties),
-        pd=py_utils.NestedMap(imgid=p.imgids, bbox=p.boxes, score=p.scores))
+        feed_dict={},
+        scalar_metrics=scalar_metrics,
+        curve_metrics=curve_metrics)
 
   def _BuildMetric(self, feed_data, classid):
     """Construct tensors and the feed_dict for Waymo metric op.
 
     Args:
-      feed_data: a NestedMap returned by _GetData().
+      feed_data: a _FeedData returned by _GetData().
       classid: integer.
 
     Returns:
@@ -172,65 +243,52 @@ class WaymoAPMetrics(ap_metric.APMetrics):
       - curves: a dict mapping all the curve names to fetch tensors.
       - feed_dict: a dict mapping the tensors in feed_tensors to feed values.
     """
-    breakdown_names = config_util.get_breakdown_names_from_config(
-        self._waymo_metric_config)
     if feed_data is None:
-      dummy_scalar = tf.constant(np.nan)
-      dummy_curve = tf.zeros([self.metadata.NumberOfPrecisionRecallPoints(), 2],
-                             tf.float32)
-      scalar_metrics = {'ap': dummy_scalar, 'ap_ha_weighted': dummy_scalar}
-      curve_metrics = {'pr': dummy_curve, 'pr_ha_weighted': dummy_curve}
-
-      for i, metric in enumerate(breakdown_names):
-        scalar_metrics['ap_%s' % metric] = dummy_scalar
-        scalar_metrics['ap_ha_weighted_%s' % metric] = dummy_scalar
-        curve_metrics['pr_%s' % metric] = dummy_curve
-        curve_metrics['pr_ha_weighted_%s' % metric] = dummy_curve
-
-      return py_utils.NestedMap(
-          feed_dict={},
-          scalar_metrics=scalar_metrics,
-          curve_metrics=curve_metrics)
+      return self._DummyMetrics()
 
     feed_dict = {}
 
     f_gt_bbox = tf.placeholder(tf.float32)
-    feed_dict[f_gt_bbox] = feed_data.gt.bbox
+    feed_dict[f_gt_bbox] = feed_data.gt_bbox
 
-    f_gt_imgid = tf.placeholder(tf.int32)
-    feed_dict[f_gt_imgid] = feed_data.gt.imgid
+    # Boxes3D stores image ids in a float64 buffer, so they are converted to
+    # the int64 frame ids the op expects here rather than cast in the graph.
+    f_gt_imgid = tf.placeholder(tf.int64)
+    feed_dict[f_gt_imgid] = feed_data.gt_imgid.astype(np.int64, copy=False)
 
     f_gt_speed = tf.placeholder(tf.float32)
-    feed_dict[f_gt_speed] = feed_data.gt.speed
+    feed_dict[f_gt_speed] = feed_data.gt_speed
 
     f_gt_difficulty = tf.placeholder(tf.uint8)
-    feed_dict[f_gt_difficulty] = feed_data.gt.difficulty
+    feed_dict[f_gt_difficulty] = feed_data.gt_difficulty
 
     f_pd_bbox = tf.placeholder(tf.float32)
-    feed_dict[f_pd_bbox] = feed_data.pd.bbox
+    feed_dict[f_pd_bbox] = feed_data.pd_bbox
 
-    f_pd_imgid = tf.placeholder(tf.int32)
-    feed_dict[f_pd_imgid] = feed_data.pd.imgid
+    f_pd_imgid = tf.placeholder(tf.int64)
+    feed_dict[f_pd_imgid] = feed_data.pd_imgid.astype(np.int64, copy=False)
 
     f_pd_score = tf.placeholder(tf.float32)
-    feed_dict[f_pd_score] = feed_data.pd.score
-
-    num_gt_bboxes = feed_data.gt.imgid.shape[0]
-    num_pd_bboxes = feed_data.pd.imgid.shape[0]
-    gt_class_ids = tf.constant(classid, dtype=tf.uint8, shape=[num_gt_bboxes])
-    pd_class_ids = tf.constant(classid, dtype=tf.uint8, shape=[num_pd_bboxes])
+    feed_dict[f_pd_score] = feed_data.pd_score
+
+    # Every box has the same class, so the per-box class ids are built at run
+    # time from a scalar instead of being baked into the graph as a per-box
+    # constant.
+    class_id = tf.constant(classid, dtype=tf.uint8)
+    gt_class_ids = tf.broadcast_to(class_id, tf.shape(f_gt_imgid))
+    pd_class_ids = tf.broadcast_to(class_id, tf.shape(f_pd_imgid))
     ap, ap_ha, pr, pr_ha, _ = py_metrics_ops.detection_metrics(
         prediction_bbox=f_pd_bbox,
         prediction_type=pd_class_ids,
         prediction_score=f_pd_score,
-        prediction_frame_id=tf.cast(f_pd_imgid, tf.int64),
+        prediction_frame_id=f_pd_imgid,
         prediction_overlap_nlz=tf.zeros_like(f_pd_imgid, dtype=tf.bool),
         ground_truth_bbox=f_gt_bbox,
         ground_truth_type=gt_class_ids,
-        ground_truth_frame_id=tf.cast(f_gt_imgid, tf.int64),
+        ground_truth_frame_id=f_gt_imgid,
         ground_truth_difficulty=f_gt_difficulty,
         ground_truth_speed=f_gt_speed,
-        config=self._waymo_metric_config.SerializeToString())
+        config=self._config_serialized)
 
     # All tensors returned by Waymo's metric op have a leading dimension
     # B=number of breakdowns. At this moment we always use B=1 to make
@@ -238,12 +296,13 @@ class WaymoAPMetrics(ap_metric.APMetrics):
     scalar_metrics = {'ap': ap[0], 'ap_ha_weighted': ap_ha[0]}
     curve_metrics = {'pr': pr[0], 'pr_ha_weighted': pr_ha[0]}
 
-    for i, metric in enumerate(breakdown_names):
+    metric_keys = self._breakdown_metrics['waymo']._metric_keys  # pylint:disable=protected-access
+    for i, (ap_key, aph_key, pr_key, prh_key) in enumerate(metric_keys):
       # There is a scalar / curve for every breakdown.
-      scalar_metrics['ap_%s' % metric] = ap[i]
-      scalar_metrics['ap_ha_weighted_%s' % metric] = ap_ha[i]
-      curve_metrics['pr_%s' % metric] = pr[i]
-      curve_metrics['pr_ha_weighted_%s' % metric] = pr_ha[i]
+      scalar_metrics[ap_key] = ap[i]
+      scalar_metrics[aph_key] = ap_ha[i]
+      curve_metrics[pr_key] = pr[i]
+      curve_metrics[prh_key] = pr_ha[i]
     return py_utils.NestedMap(
         feed_dict=feed_dict,
         scalar_metrics=scalar_metrics,
@@ -285,13 +344,28 @@ class WaymoAPMetrics(ap_metric.APMetrics):
     scalar_fetches = []
     curve_fetches = []
     with g.as_default():
+      # Each class is evaluated with its own op invocation rather than one op
+      # over the concatenated boxes of all classes: the ONE_SHARD breakdown
+      # does not slice by object type, so a fused call would match and score
+      # boxes of different classes against each other.  All per-class ops are
+      # still fetched in the single session.run below, where they have no
+      # dependencies on each other and so are executed concurrently by the
+      # session's inter-op thread pool.
+      dummy_metrics = None
       for classid in classids:
         data = self._GetData(
             classid,
             distance=distance,
             num_points=num_points,
             rotation=rotation)
-        metrics = self._BuildMetric(data, classid)
+        if data is None:
+          # Classes without data share one set of dummy tensors, built the
+          # first time one is needed.
+          if dummy_metrics is None:
+            dummy_metrics = self._BuildMetric(data, classid)
+          metrics = dummy_metrics
+        else:
+          metrics = self._BuildMetric(data, classid)
         scalar_fetches += [metrics.scalar_metrics]
         curve_fetches += [metrics.curve_metrics]
         feed_dict.update(metrics.feed_dict)
@@ -306,17 +380,11 @@ class WaymoAPMetrics(ap_metric.APMetrics):
     """Returns weighted mAP over all eval classes."""
     self._EvaluateIfNecessary()
     ap = self._breakdown_metrics['waymo']._average_precisions  # pylint:disable=protected-access
-    breakdown_names = config_util.get_breakdown_names_from_config(
-        self._waymo_metric_config)
 
-    num_sum = 0.0
-    denom_sum = 0.0
     # Compute the average AP over all eval classes.  The first breakdown
     # is the overall mAP.
-    for class_index in range(len(self.metadata.EvalClassIndices())):
-      num_sum += np.nan_to_num(ap[breakdown_names[0]][class_index])
-      denom_sum += 1.
-    return num_sum / denom_sum
+    overall_ap = np.asarray(ap[self._breakdown_names[0]], dtype=np.float64)
+    return float(np.nan_to_num(overall_ap).mean())
 
   def Summary(self, name):
     """Implements custom Summary for Waymo metrics."""
@@ -328,33 +396,25 @@ class WaymoAPMetrics(ap_metric.APMetrics):
 
     ap = self._breakdown_metrics['waymo']._average_precisions  # pylint:disable=protected-access
     aph = self._breakdown_metrics['waymo']._average_precision_headings  # pylint:disable=protected-access
-    breakdown_names = config_util.get_breakdown_names_from_config(
-        self._waymo_metric_config)
-
-    for i, class_index in enumerate(self.metadata.EvalClassIndices()):
-      classname = self.metadata.ClassNames()[class_index]
-      for breakdown_name in breakdown_names:
-        # 'ONE_SHARD' breakdowns are the overall metrics (not sliced up)
-        # So we should make that the defualt metric.
-        if 'ONE_SHARD' in breakdown_name:
-          # For the overall mAP, include the class name
-          # and set the breakdown_str which will have the level
-          prefix = '{}/{}'.format(name, classname)
-          postfix = breakdown_name.replace('ONE_SHARD_', '')
-          breakdown_str = postfix if postfix else 'UNKNOWN'
-        # Otherwise check that the class we are looking at is in the breakdown.
-        elif classname.lower() in breakdown_name.lower():
-          prefix = '{}_extra'.format(name)
-          breakdown_str = breakdown_name
-        else:
-          continue
-
-        tag_str = '{}/AP_{}'.format(prefix, breakdown_str)
-        ap_value = ap[breakdown_name][i]
-        ret.value.add(tag=tag_str, simple_value=ap_value)
-        tag_str = '{}/APH_{}'.format(prefix, breakdown_str)
-        aph_value = aph[breakdown_name][i]
-        ret.value.add(tag=tag_str, simple_value=aph_value)
+    summary_pairs = self._breakdown_metrics['waymo']._summary_pairs  # pylint:disable=protected-access
+
+    for i, classname, breakdown_name, is_overall in summary_pairs:
+      if is_overall:
+        # For the overall mAP, include the class name
+        # and set the breakdown_str which will have the level
+        prefix = '{}/{}'.format(name, classname)
+        postfix = breakdown_name.replace('ONE_SHARD_', '')
+        breakdown_str = postfix if postfix else 'UNKNOWN'
+      else:
+        prefix = '{}_extra'.format(name)
+        breakdown_str = breakdown_name
+
+      tag_str = '{}/AP_{}'.format(prefix, breakdown_str)
+      ap_value = ap[breakdown_name][i]
+      ret.value.add(tag=tag_str, simple_value=ap_value)
+      tag_str = '{}/APH_{}'.format(prefix, breakdown_str)
+      aph_value = aph[breakdown_name][i]
+      ret.value.add(tag=tag_str, simple_value=aph_value)
 
     image_summaries = self._breakdown_metrics['waymo'].GenerateSummaries(name)
     for image_summary in image_summaries:
@@ -379,6 +439,10 @@ class WaymoBreakdownMetric(breakdown_metric.BreakdownMetric):
     super(WaymoBreakdownMetric, self).__init__(p)
     self._average_precision_headings = {}
     self._precision_recall_headings = {}
+    # Maps breakdown name to contiguous [C, P] (precision, recall) arrays.
+    self._precision_split = {}
+    self._summary_pairs = _BuildSummaryPairs(p.metadata, p.breakdown_list)
+    self._metric_keys = _BuildMetricKeys(p.breakdown_list)
 
   def ComputeMetrics(self, compute_metrics_fn):
     p = self.params
@@ -386,65 +450,62 @@ class WaymoBreakdownMetric(breakdown_metric.BreakdownMetric):
     metrics = compute_metrics_fn()
     scalars = metrics['scalars']
     curves = metrics['curves']
+    curve_shape = (len(curves), p.metadata.NumberOfPrecisionRecallPoints(), 2)
 
-    for breakdown_str in p.breakdown_list:
-      self._average_precisions[breakdown_str] = [
-          s['ap_%s' % breakdown_str] for s in scalars
-      ]
+    for breakdown_str, (ap_key, aph_key, pr_key, prh_key) in zip(
+        p.breakdown_list, self._metric_keys):
+      self._average_precisions[breakdown_str] = [s[ap_key] for s in scalars]
       self._average_precision_headings[breakdown_str] = [
-          s['ap_ha_weighted_%s' % breakdown_str] for s in scalars
+          s[aph_key] for s in scalars
       ]
-      self._precision_recall[breakdown_str] = np.array(
-          [c['pr_%s' % breakdown_str] for c in curves])
-      self._precision_recall_headings[breakdown_str] = np.array(
-          [c['pr_ha_weighted_%s' % breakdown_str] for c in curves])
+      # Fill the [C, P, 2] curve buffers in place rather than stacking a
+      # temporary list of per-class curves.
+      pr = np.empty(curve_shape, dtype=np.float32)
+      pr_ha = np.empty(curve_shape, dtype=np.float32)
+      for i, c in enumerate(curves):
+        pr[i] = c[pr_key]
+        pr_ha[i] = c[prh_key]
+      self._precision_recall[breakdown_str] = pr
+      self._precision_split[breakdown_str] = (pr[..., 0].copy(),
+                                              pr[..., 1].copy())
+      self._precision_recall_headings[breakdown_str] = pr_ha
     tf.logging.info('Calculating waymo AP breakdowns: finished')
 
   def GenerateSummaries(self, name):
     """Generate an image summary for precision recall by difficulty."""
-    p = self.params
-
     image_summaries = []
-    for i, class_index in enumerate(p.metadata.EvalClassIndices()):
-
-      def _Setter(fig, axes):
-        """Configure the plot for precision recall."""
-        ticks = np.arange(0, 1.05, 0.1)
-        axes.grid(b=False)
-        axes.set_xlabel('Recall')
-        axes.set_xticks(ticks)
-        axes.set_ylabel('Precision')
-        axes.set_yticks(ticks)
-        # TODO(vrv): Add legend indicating number of objects in breakdown.
-        fig.tight_layout()
-
-      classname = p.metadata.ClassNames()[class_index]
-      for breakdown_name in p.breakdown_list:
-        # 'ONE_SHARD' breakdowns are the overall metrics (not sliced up)
-        # So we should never skip this.
-        if 'ONE_SHARD' in breakdown_name:
-          breakdown_str = breakdown_name.replace('ONE_SHARD_', '')
-          tag_str = '{}/{}/{}/PR'.format(name, classname, breakdown_str)
-        # Otherwise check that the class we are looking at is in the breakdown.
-        elif classname.lower() in breakdown_name.lower():
-          tag_str = '{}/{}/{}/PR'.format(name, classname, breakdown_name)
-        else:
-          continue
-
-        ps = [self._precision_recall[breakdown_name][i][:, 0]]
-        rs = [self._precision_recall[breakdown_name][i][:, 1]]
-        image_summary = plot.Curve(
-            name=tag_str,
-            figsize=(10, 8),
-            xs=rs[0],
-            ys=np.array(ps).T,
-            setter=_Setter,
-            marker='.',
-            markersize=14,
-            linestyle='-',
-            linewidth=2,
-            alpha=0.5)
-        image_summaries.append(image_summary)
+
+    def _Setter(fig, axes):
+      """Configure the plot for precision recall."""
+      ticks = np.arange(0, 1.05, 0.1)
+      axes.grid(b=False)
+      axes.set_xlabel('Recall')
+      axes.set_xticks(ticks)
+      axes.set_ylabel('Precision')
+      axes.set_yticks(ticks)
+      # TODO(vrv): Add legend indicating number of objects in breakdown.
+      fig.tight_layout()
+
+    for i, classname, breakdown_name, is_overall in self._summary_pairs:
+      if is_overall:
+        breakdown_str = breakdown_name.replace('ONE_SHARD_', '')
+        tag_str = '{}/{}/{}/PR'.format(name, classname, breakdown_str)
+      else:
+        tag_str = '{}/{}/{}/PR'.format(name, classname, breakdown_name)
+
+      ps, rs = self._precision_split[breakdown_name]
+      image_summary = plot.Curve(
+          name=tag_str,
+          figsize=(10, 8),
+          xs=rs[i],
+          ys=ps[i][:, np.newaxis],
+          setter=_Setter,
+          marker='.',
+          markersize=14,
+          linestyle='-',
+          linewidth=2,
+          alpha=0.5)
+      image_summaries.append(image_summary)
     return image_summaries
 
   # Fill in dummy implementations which are largely
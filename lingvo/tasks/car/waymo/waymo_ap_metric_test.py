@@ -26,6 +26,7 @@ from lingvo.tasks.car.waymo import waymo_ap_metric
 from lingvo.tasks.car.waymo import waymo_metadata
 import numpy as np
 from waymo_open_dataset import label_pb2
+from waymo_open_dataset.metrics.python import config_util_py as config_util
 
 FLAGS = tf.flags.FLAGS
 
@@ -48,6 +49,34 @@ class APTest(test_utils.TestCase):
     self.assertNear(config.iou_thresholds[cyc_idx], thresholds_meta['Cyclist'],
                     1e-6)
 
+  def testWaymoAPConfigUnknownBreakdown(self):
+    metadata = waymo_metadata.WaymoMetadata()
+    with self.assertRaises(ValueError):
+      waymo_ap_metric._BuildWaymoMetricConfig(metadata, '3d',
+                                              ['NOT_A_BREAKDOWN'])
+
+  def testWaymoSummaryPairs(self):
+    metadata = waymo_metadata.WaymoMetadata()
+    config = waymo_ap_metric._BuildWaymoMetricConfig(metadata, '3d', ['RANGE'])
+    breakdown_names = config_util.get_breakdown_names_from_config(config)
+    pairs = waymo_ap_metric._BuildSummaryPairs(metadata, breakdown_names)
+
+    # ONE_SHARD breakdowns are emitted for every eval class.
+    one_shard_names = [b for b in breakdown_names if 'ONE_SHARD' in b]
+    self.assertTrue(one_shard_names)
+    for i, class_index in enumerate(metadata.EvalClassIndices()):
+      classname = metadata.ClassNames()[class_index]
+      for breakdown_name in one_shard_names:
+        self.assertIn((i, classname, breakdown_name, True), pairs)
+
+    # Extra breakdowns are only emitted for the class named in them.
+    vehicle_range = 'RANGE_TYPE_VEHICLE_[0, 30)_LEVEL_1'
+    self.assertIn((0, 'Vehicle', vehicle_range, False), pairs)
+    for i, classname, breakdown_name, is_overall in pairs:
+      if not is_overall:
+        self.assertIn(classname.upper(), breakdown_name)
+        self.assertNotIn('SIGN', breakdown_name)
+
   def testPerfectBox(self):
     metadata = waymo_metadata.WaymoMetadata()
     params = waymo_ap_metric.WaymoAPMetrics.Params(metadata)